@@ -14,12 +14,16 @@ are discovered lazily on first request — no server restart required.
 
 import json
 import logging
+import logging.handlers
 import os
+import queue
+import selectors
 import signal
 import socket
 import struct
 import sys
 import threading
+import time
 from pathlib import Path
 
 # Add app directory to path for imports
@@ -27,11 +31,83 @@ sys.path.insert(0, '/app')
 
 from tool_caller import ToolCaller, ToolConfig, create_auto_caller
 
+# orjson parses/serializes in C and works on bytes directly; fall back to
+# the stdlib so the server still runs where it isn't installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(data):
+    """Parse a request payload (bytes-like)."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects escaped lone surrogates, which stdlib clients
+            # send for non-UTF-8 argv/cwd; let json have the final say.
+            pass
+    return json.loads(bytes(data))
+
+
+def json_dumps(obj) -> bytes:
+    """Serialize a response to bytes."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except orjson.JSONEncodeError:
+            # Lone surrogates (e.g. a non-UTF-8 path in an error message)
+            pass
+    return json.dumps(obj).encode()
+
+
 logger = logging.getLogger(__name__)
 
 # Configuration
 WORKSPACE = '/workspace'
 MAX_MSG = 64 * 1024
+# 4-byte big-endian length prefix framing every message
+LENGTH_PREFIX = struct.Struct('>I')
+MAX_WORKERS = 16
+# Extra short-lived handler threads allowed once all MAX_WORKERS are busy
+MAX_OVERFLOW = 64
+LISTEN_BACKLOG = 1024
+# Send buffer for accepted connections. On AF_UNIX stream sockets the
+# sender's buffer bounds how much output can be queued per write, so a
+# larger one lets big tool outputs go out in fewer blocking sendmsg calls.
+# The kernel clamps this to net.core.wmem_max.
+SEND_BUFFER_SIZE = 1024 * 1024
+
+# Per-thread request buffer (length prefix + largest allowed payload),
+# reused across connections handled by the same worker so reads don't
+# allocate per recv.
+_local = threading.local()
+
+
+def _recv_buffer() -> memoryview:
+    """Return this thread's receive buffer."""
+    view = getattr(_local, 'recv_buffer', None)
+    if view is None:
+        view = _local.recv_buffer = memoryview(bytearray(LENGTH_PREFIX.size + MAX_MSG))
+    return view
+
+
+def _recv_into(conn: socket.socket, view: memoryview, minimum: int | None = None) -> int:
+    """Read into view until at least minimum bytes (default: all of view).
+
+    Each recv_into may return more than the minimum, up to len(view).
+    Returns the number of bytes read; fewer than minimum only on EOF.
+    """
+    if minimum is None:
+        minimum = len(view)
+    received = 0
+    while received < minimum:
+        n = conn.recv_into(view[received:])
+        if not n:
+            break
+        received += n
+    return received
 
 
 class ToolServer:
@@ -45,10 +121,30 @@ class ToolServer:
         self,
         socket_path: str,
         tool_caller: ToolCaller | None = None,
+        max_workers: int = MAX_WORKERS,
+        max_overflow: int = MAX_OVERFLOW,
     ):
+        if max_workers < 1:
+            raise ValueError(f'max_workers must be at least 1, got {max_workers}')
+        if max_overflow < 0:
+            raise ValueError(f'max_overflow must not be negative, got {max_overflow}')
         self.socket_path = socket_path
+        self.max_workers = max_workers
+        self.max_overflow = max_overflow
         self._running = False
         self._server: socket.socket | None = None
+        self._selector: selectors.BaseSelector | None = None
+        # Handler thread bookkeeping: kept and overflow threads running,
+        # kept threads waiting on _handoff, and connections queued there
+        # for lack of a free thread
+        self._workers = 0
+        self._overflow = 0
+        self._idle_workers = 0
+        self._queued = 0
+        self._workers_lock = threading.Lock()
+        self._handoff: queue.SimpleQueue[socket.socket] = queue.SimpleQueue()
+        self._wakeup_r: int | None = None
+        self._wakeup_w: int | None = None
 
         # Use provided caller or create default
         if tool_caller is None:
@@ -64,15 +160,33 @@ class ToolServer:
             sock_file.unlink()
         sock_file.parent.mkdir(parents=True, exist_ok=True)
 
-        # Create socket
+        # Create socket. SO_PASSCRED is deliberately left off: with it set
+        # on either end, every AF_UNIX send/recv takes and drops pid/cred
+        # references, which measurably slows small request/response traffic.
+        # Access is controlled by the socket file mode instead.
         self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
         self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self._server.bind(self.socket_path)
-        self._server.listen(5)
+        self._server.listen(LISTEN_BACKLOG)
+        # Non-blocking so a connection that goes away between select() and
+        # accept() can't stall the loop; accepted sockets stay blocking.
+        self._server.setblocking(False)
         os.chmod(self.socket_path, 0o660)
 
         self._running = True
-        logger.info(f'Server listening on {self.socket_path}')
+        logger.info(
+            'Server listening on %s (max_workers=%d, max_overflow=%d)',
+            self.socket_path, self.max_workers, self.max_overflow,
+        )
+
+        # Self-pipe: the signal handler writes a byte so the blocking
+        # select() below wakes immediately instead of polling _running.
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup_w, False)
+
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._server, selectors.EVENT_READ)
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ)
 
         # Signal handlers
         signal.signal(signal.SIGTERM, self._shutdown)
@@ -80,19 +194,29 @@ class ToolServer:
 
         # Accept loop
         while self._running:
-            try:
-                self._server.settimeout(1.0)
-                conn, _ = self._server.accept()
-                threading.Thread(
-                    target=self._handle,
-                    args=(conn,),
-                    daemon=True
-                ).start()
-            except socket.timeout:
-                continue
-            except Exception as e:
-                if self._running:
-                    logger.error(f'Failed to accept connection: {type(e).__name__}: {e}')
+            for key, _ in self._selector.select():
+                if key.fileobj is not self._server:
+                    continue
+                try:
+                    conn, _ = self._server.accept()
+                except BlockingIOError:
+                    continue
+                except Exception as e:
+                    if self._running:
+                        logger.error('Failed to accept connection: %s: %s', type(e).__name__, e)
+                    continue
+                try:
+                    # Best-effort: the default buffer still works, just with
+                    # more sendmsg calls for large outputs
+                    conn.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_BUFFER_SIZE)
+                except OSError as e:
+                    logger.debug('Could not enlarge send buffer: %s', e)
+                try:
+                    self._dispatch(conn)
+                except Exception as e:
+                    # Close it so the client sees EOF instead of waiting forever
+                    logger.error('Failed to dispatch connection: %s: %s', type(e).__name__, e)
+                    conn.close()
 
         self._cleanup()
 
@@ -100,16 +224,88 @@ class ToolServer:
         """Handle shutdown signal."""
         logger.info('Received shutdown signal, stopping server')
         self._running = False
+        if self._wakeup_w is not None:
+            try:
+                os.write(self._wakeup_w, b'\0')
+            except OSError:
+                # Pipe full (a wakeup is already pending) or being closed
+                pass
 
     def _cleanup(self):
         """Clean up resources."""
+        if self._selector:
+            self._selector.close()
         if self._server:
             self._server.close()
+        # Clear the attributes before closing so a signal arriving during
+        # cleanup can't write to a closed (or reused) descriptor
+        wakeup_fds = (self._wakeup_r, self._wakeup_w)
+        self._wakeup_r = self._wakeup_w = None
+        for fd in wakeup_fds:
+            if fd is not None:
+                os.close(fd)
         sock_file = Path(self.socket_path)
         if sock_file.exists():
             sock_file.unlink()
         logger.info('Server stopped, socket cleaned up')
 
+    def _dispatch(self, conn: socket.socket):
+        """Hand a connection to a handler thread.
+
+        Up to max_workers threads are kept and reused across connections.
+        Once that many are busy, up to max_overflow more are started for a
+        burst of long calls (clones, test runs), so it doesn't hold up other
+        requests; they exit once there is no backlog left. Beyond that,
+        connections wait in _handoff for the next free thread. All handler
+        threads are daemons, so in-flight calls don't hold up exit.
+        """
+        with self._workers_lock:
+            if self._idle_workers:
+                self._idle_workers -= 1
+                self._handoff.put(conn)
+                return
+            if self._workers < self.max_workers:
+                self._workers += 1
+                keep = True
+            elif self._overflow < self.max_overflow:
+                self._overflow += 1
+                keep = False
+            else:
+                self._queued += 1
+                self._handoff.put(conn)
+                return
+
+        name = 'tool-worker' if keep else 'tool-overflow'
+        thread = threading.Thread(target=self._worker, args=(conn, keep), name=name, daemon=True)
+        try:
+            thread.start()
+        except RuntimeError:
+            # Couldn't start a thread: give the slot back for the next one
+            with self._workers_lock:
+                if keep:
+                    self._workers -= 1
+                else:
+                    self._overflow -= 1
+            raise
+
+    def _worker(self, conn: socket.socket, keep: bool):
+        """Handle conn, then serve connections handed off by _dispatch.
+
+        Kept workers wait for the next connection indefinitely; overflow
+        workers exit as soon as nothing is queued.
+        """
+        while True:
+            self._handle(conn)
+            with self._workers_lock:
+                if self._queued:
+                    self._queued -= 1
+                elif keep:
+                    self._idle_workers += 1
+                else:
+                    self._overflow -= 1
+                    return
+            conn = self._handoff.get()
+
     def _handle(self, conn: socket.socket):
         """Handle a client connection."""
         try:
@@ -119,7 +315,7 @@ class ToolServer:
                 return
 
             tool = request.get('tool', '?')
-            logger.info(f'Request: tool={tool}, args={len(request.get("args", []))}')
+            logger.info('Request: tool=%s, args=%d', tool, len(request.get('args', [])))
 
             # Process and respond
             response = self._process(request)
@@ -127,58 +323,68 @@ class ToolServer:
             exit_code = response.get('exit_code', -1)
             has_error = bool(response.get('error'))
             log_fn = logger.warning if (exit_code != 0 or has_error) else logger.info
-            log_fn(f'Response: tool={tool}, exit_code={exit_code}, error={has_error}')
+            log_fn('Response: tool=%s, exit_code=%s, error=%s', tool, exit_code, has_error)
 
             self._write(conn, response)
 
         except Exception as e:
-            logger.exception(f'Connection handler failed: {type(e).__name__}: {e}')
+            logger.exception('Connection handler failed: %s: %s', type(e).__name__, e)
         finally:
             conn.close()
 
     def _read(self, conn: socket.socket) -> dict | None:
         """Read a request from connection."""
         try:
-            # Read length prefix
-            length_data = b''
-            while len(length_data) < 4:
-                chunk = conn.recv(4 - len(length_data))
-                if not chunk:
-                    logger.debug('Client disconnected before sending data')
-                    return None
-                length_data += chunk
-
-            length = struct.unpack('>I', length_data)[0]
+            buf = _recv_buffer()
+
+            # Read length prefix. The client sends prefix and payload in one
+            # write, so this first recv normally picks up the whole request.
+            received = _recv_into(conn, buf, LENGTH_PREFIX.size)
+            if received < LENGTH_PREFIX.size:
+                logger.debug('Client disconnected before sending data')
+                return None
+
+            length = LENGTH_PREFIX.unpack_from(buf)[0]
             if length > MAX_MSG:
-                logger.warning(f'Rejected oversized message: {length} bytes (max={MAX_MSG})')
+                logger.warning('Rejected oversized message: %d bytes (max=%d)', length, MAX_MSG)
                 return None
 
-            # Read payload
-            data = b''
-            while len(data) < length:
-                chunk = conn.recv(min(4096, length - len(data)))
-                if not chunk:
-                    logger.warning(f'Client disconnected mid-read: got {len(data)}/{length} bytes')
-                    return None
-                data += chunk
+            # Read whatever remains of the payload
+            end = LENGTH_PREFIX.size + length
+            if received < end:
+                received += _recv_into(conn, buf[received:end])
+            if received < end:
+                logger.warning('Client disconnected mid-read: got %d/%d bytes', received - LENGTH_PREFIX.size, length)
+                return None
 
-            return json.loads(data)
+            payload = buf[LENGTH_PREFIX.size:end]
+            return json_loads(payload)
         except json.JSONDecodeError as e:
-            logger.error(f'Failed to parse request JSON: {e}')
+            logger.error('Failed to parse request JSON: %s', e)
             return None
         except Exception as e:
-            logger.error(f'Failed to read request: {type(e).__name__}: {e}')
+            logger.error('Failed to read request: %s: %s', type(e).__name__, e)
             return None
 
     def _write(self, conn: socket.socket, response: dict):
         """Write response to connection."""
         try:
-            payload = json.dumps(response).encode()
-            conn.sendall(struct.pack('>I', len(payload)) + payload)
+            payload = json_dumps(response)
+            # Gather header and payload in one sendmsg rather than
+            # concatenating them, which would copy the whole (possibly
+            # multi-MB) payload just to prepend four bytes.
+            buffers = [memoryview(LENGTH_PREFIX.pack(len(payload))), memoryview(payload)]
+            while buffers:
+                sent = conn.sendmsg(buffers)
+                while buffers and sent >= len(buffers[0]):
+                    sent -= len(buffers[0])
+                    buffers.pop(0)
+                if sent:
+                    buffers[0] = buffers[0][sent:]
         except BrokenPipeError:
             logger.warning('Client disconnected before response could be sent')
         except Exception as e:
-            logger.error(f'Failed to write response: {type(e).__name__}: {e}')
+            logger.error('Failed to write response: %s: %s', type(e).__name__, e)
 
     def _process(self, request: dict) -> dict:
         """Process a request and return response.
@@ -215,22 +421,106 @@ def create_tool_caller() -> ToolCaller:
     )
 
 
-def main():
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s %(levelname)s [%(name)s] %(message)s',
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that renders the asctime seconds part once per second.
+
+    The default formatTime calls strftime for every record; the date and
+    time only change once a second, so reuse that part and just append
+    the milliseconds.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_time: tuple[int, str] = (-1, '')
+
+    def formatTime(self, record, datefmt=None):
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        # No lock: after stop_logging() handler threads format records
+        # concurrently, but _cached_time is only ever read and replaced as
+        # a whole tuple, so a racing thread at worst renders the same
+        # second twice.
+        second = int(record.created)
+        cached_second, formatted = self._cached_time
+        if second != cached_second:
+            formatted = time.strftime(self.default_time_format, self.converter(record.created))
+            self._cached_time = (second, formatted)
+        return self.default_msec_format % (formatted, record.msecs)
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """Route log records through a queue to a background writer thread.
+
+    Handler threads only enqueue records; the blocking write to stderr
+    happens on the listener thread, off the request path.
+    """
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        CachedTimeFormatter('%(asctime)s %(levelname)s [%(name)s] %(message)s')
     )
 
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
+
+
+def stop_logging(listener: logging.handlers.QueueListener):
+    """Write out queued records and log synchronously from then on.
+
+    Handler threads are daemons and may still be running when main()
+    returns, so the root logger is pointed at the real handlers before
+    the listener stops; nothing they log afterwards is left in a queue
+    that no one drains.
+    """
+    root = logging.getLogger()
+    for handler in listener.handlers:
+        root.addHandler(handler)
+    for handler in root.handlers[:]:
+        if isinstance(handler, logging.handlers.QueueHandler):
+            root.removeHandler(handler)
+    listener.stop()
+
+
+def main():
+    """Run the tool server.
+
+    Environment variables:
+        TOOL_SOCKET      - Socket path to listen on (required)
+        MAX_WORKERS      - Handler threads kept for reuse (default: 16)
+
+    See create_tool_caller() for the tool configuration variables.
+    """
+    log_listener = setup_logging()
+
     socket_path = os.environ.get('TOOL_SOCKET')
     if not socket_path:
         logger.error('TOOL_SOCKET environment variable must be set')
+        stop_logging(log_listener)
+        sys.exit(1)
+
+    max_workers_env = os.environ.get('MAX_WORKERS', str(MAX_WORKERS))
+    try:
+        max_workers = int(max_workers_env)
+    except ValueError:
+        max_workers = 0
+    if max_workers < 1:
+        logger.error('MAX_WORKERS must be a positive integer, got: %r', max_workers_env)
+        stop_logging(log_listener)
         sys.exit(1)
 
     tool_caller = create_tool_caller()
-    server = ToolServer(socket_path, tool_caller=tool_caller)
+    server = ToolServer(socket_path, tool_caller=tool_caller, max_workers=max_workers)
 
     logger.info('Starting tool server')
-    server.start()
+    try:
+        server.start()
+    finally:
+        stop_logging(log_listener)
 
 
 if __name__ == '__main__':
@@ -36,6 +36,7 @@ Environment variables passed to wrappers:
 import json
 import logging
 import os
+import shutil
 import subprocess
 from dataclasses import dataclass
 from pathlib import Path
@@ -47,8 +48,15 @@ DEFAULT_TOOLS_DIR = '/app/tools.d'
 DEFAULT_RESTRICTED_DIR = '/app/restricted'
 DEFAULT_WORKSPACE = '/workspace'
 
+# Interpreter used to run a wrapper, keyed by file suffix. Wrappers with
+# any other suffix are executed directly.
+WRAPPER_INTERPRETERS = {
+    '.py': 'python3',
+    '.sh': 'bash',
+}
 
-@dataclass
+
+@dataclass(slots=True)
 class ToolResult:
     """Result of a tool invocation."""
     exit_code: int
@@ -68,7 +76,7 @@ class ToolResult:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolConfig:
     """Configuration for a tool."""
     binary: str
@@ -95,6 +103,26 @@ class ToolCaller:
         self.restricted_dir = Path(restricted_dir)
         self.workspace = workspace
         self._setup_completed: set[str] = set()
+        self._verified_binaries: set[str] = set()
+        # Snapshot once; per-call envs are built on top of this instead
+        # of copying os.environ for every invocation
+        self._base_env = dict(os.environ)
+        # Resolve wrapper interpreters once so each spawn execs an absolute
+        # path instead of searching PATH again
+        self._interpreters = self._resolve_interpreters()
+
+    def _resolve_interpreters(self) -> dict[str, str]:
+        """Map wrapper suffixes to absolute interpreter paths."""
+        search_path = self._base_env.get('PATH')
+        interpreters = {}
+        for suffix, name in WRAPPER_INTERPRETERS.items():
+            resolved = shutil.which(name, path=search_path)
+            if resolved:
+                interpreters[suffix] = resolved
+            else:
+                logger.warning('Wrapper interpreter not found in PATH: %s (for *%s wrappers)', name, suffix)
+                interpreters[suffix] = name
+        return interpreters
 
     def register_tool(self, name: str, config: ToolConfig):
         """Register a tool configuration."""
@@ -256,7 +284,7 @@ class ToolCaller:
             for candidate in tool_candidates:
                 if candidate.exists() and candidate.is_file():
                     if os.access(candidate, os.X_OK) or candidate.suffix == '.py':
-                        logger.debug(f'Found tool-specific wrapper: {candidate}')
+                        logger.debug('Found tool-specific wrapper: %s', candidate)
                         return candidate
 
         # Fall back to global restricted directory
@@ -269,7 +297,7 @@ class ToolCaller:
             for candidate in global_candidates:
                 if candidate.exists() and candidate.is_file():
                     if os.access(candidate, os.X_OK) or candidate.suffix == '.py':
-                        logger.debug(f'Found global wrapper: {candidate}')
+                        logger.debug('Found global wrapper: %s', candidate)
                         return candidate
 
         return None
@@ -285,7 +313,7 @@ class ToolCaller:
         # Check tool is registered; try lazy discovery if not
         if tool not in self.tools:
             if not self._try_lazy_discover(tool):
-                logger.warning(f'Rejected unknown tool: {tool}')
+                logger.warning('Rejected unknown tool: %s', tool)
                 return ToolResult(
                     exit_code=1,
                     stdout='',
@@ -295,30 +323,32 @@ class ToolCaller:
 
         config = self.tools[tool]
 
-        # Validate real binary exists
-        if not Path(config.binary).exists():
-            logger.error(f'Binary not found for tool {tool}: {config.binary}')
-            return ToolResult(
-                exit_code=127,
-                stdout='',
-                stderr='',
-                error=f"Tool not installed: {tool}",
-            )
+        # Validate real binary exists. Only a positive result is remembered:
+        # a missing binary may still be installed later (e.g. by setup.sh).
+        if config.binary not in self._verified_binaries:
+            if not Path(config.binary).exists():
+                logger.error('Binary not found for tool %s: %s', tool, config.binary)
+                return ToolResult(
+                    exit_code=127,
+                    stdout='',
+                    stderr='',
+                    error=f"Tool not installed: {tool}",
+                )
+            self._verified_binaries.add(config.binary)
 
-        # Validate cwd
-        cwd_path = Path(cwd)
-        if not cwd_path.exists():
-            logger.warning(f'CWD not found for {tool}, falling back to workspace: {cwd} -> {self.workspace}')
+        # Validate cwd (isdir: a path to a file can't be used as cwd either)
+        if not os.path.isdir(cwd):
+            logger.warning('CWD not found for %s, falling back to workspace: %s -> %s', tool, cwd, self.workspace)
             cwd = self.workspace
 
         # Check for wrapper script
         wrapper = self.find_wrapper(tool)
 
         if wrapper:
-            logger.info(f'Executing {tool} via wrapper {wrapper.name} (args={len(args)}, cwd={cwd})')
+            logger.info('Executing %s via wrapper %s (args=%d, cwd=%s)', tool, wrapper.name, len(args), cwd)
             return self._execute_wrapper(wrapper, tool, args, cwd, config)
         else:
-            logger.info(f'Executing {tool} directly (args={len(args)}, cwd={cwd})')
+            logger.info('Executing %s directly (args=%d, cwd=%s)', tool, len(args), cwd)
             return self._execute_direct(tool, args, cwd, config)
 
     def _execute_wrapper(
@@ -332,26 +362,32 @@ class ToolCaller:
         """Execute via wrapper script."""
         try:
             # Build environment for wrapper
-            env = os.environ.copy()
-            env['TOOL_NAME'] = tool
-            env['TOOL_BINARY'] = config.binary
-            env['TOOL_CWD'] = cwd
-            env['TOOL_ARGS'] = json.dumps(args)
+            env = {
+                **self._base_env,
+                'TOOL_NAME': tool,
+                'TOOL_BINARY': config.binary,
+                'TOOL_CWD': cwd,
+                'TOOL_ARGS': json.dumps(args),
+            }
 
             # Determine how to run the wrapper
-            if wrapper.suffix == '.py':
-                cmd = ['python3', str(wrapper)] + args
-            elif wrapper.suffix == '.sh':
-                cmd = ['bash', str(wrapper)] + args
+            interpreter = self._interpreters.get(wrapper.suffix)
+            if interpreter:
+                cmd = [interpreter, str(wrapper)] + args
             else:
                 cmd = [str(wrapper)] + args
 
+            # close_fds=False: every descriptor the server opens (sockets,
+            # selector, pipes) is non-inheritable by default (PEP 446), so the
+            # child still only gets stdin/stdout/stderr, and the spawn skips
+            # closing the whole fd table in the child.
             result = subprocess.run(
                 cmd,
                 cwd=cwd,
                 capture_output=True,
                 timeout=config.timeout,
                 env=env,
+                close_fds=False,
             )
 
             return ToolResult(
@@ -361,7 +397,7 @@ class ToolCaller:
             )
 
         except subprocess.TimeoutExpired:
-            logger.warning(f'Tool {tool} timed out after {config.timeout}s (wrapper={wrapper.name})')
+            logger.warning('Tool %s timed out after %ss (wrapper=%s)', tool, config.timeout, wrapper.name)
             return ToolResult(
                 exit_code=124,
                 stdout='',
@@ -369,7 +405,7 @@ class ToolCaller:
                 error='Timeout',
             )
         except Exception as e:
-            logger.error(f'Wrapper execution failed for {tool}: {type(e).__name__}: {e}')
+            logger.error('Wrapper execution failed for %s: %s: %s', tool, type(e).__name__, e)
             return ToolResult(
                 exit_code=1,
                 stdout='',
@@ -393,7 +429,8 @@ class ToolCaller:
                 cwd=cwd,
                 capture_output=True,
                 timeout=config.timeout,
-                env=os.environ.copy(),
+                env=self._base_env,
+                close_fds=False,
             )
 
             return ToolResult(
@@ -403,7 +440,7 @@ class ToolCaller:
             )
 
         except subprocess.TimeoutExpired:
-            logger.warning(f'Tool {tool} timed out after {config.timeout}s')
+            logger.warning('Tool %s timed out after %ss', tool, config.timeout)
             return ToolResult(
                 exit_code=124,
                 stdout='',
@@ -411,7 +448,7 @@ class ToolCaller:
                 error='Timeout',
             )
         except Exception as e:
-            logger.error(f'Direct execution failed for {tool}: {type(e).__name__}: {e}')
+            logger.error('Direct execution failed for %s: %s: %s', tool, type(e).__name__, e)
             return ToolResult(
                 exit_code=1,
                 stdout='',